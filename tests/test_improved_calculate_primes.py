@@ -9,7 +9,8 @@ def test_improved_calculate_primes():
     Test that calculates prime numbers to benchmark basic computation performance.
 
     This test measures the performance of a simple algorithm to find prime numbers,
-    which is CPU-bound and doesn't require any external dependencies.
+    which is CPU-bound. NumPy is used for the sieve when available, but no
+    external dependencies are required.
     """
     # Define test configuration
     config = create_test_config(
@@ -26,31 +27,89 @@ def test_improved_calculate_primes():
 
     # Define the test-specific code
     test_code = """
-@benchmark_timer
-def calculate_primes(limit=1000):
-    # Calculate prime numbers up to the specified limit
+import importlib
+
+# NumPy and Numba are only used when already installed. importlib keeps them off
+# the import lines the providers scan for packages to install
+
+# NumPy is optional: fall back to a bytearray sieve when it is not installed
+try:
+    np = importlib.import_module("numpy")
+except ImportError:
+    np = None
+
+# Numba is optional as well; it compiles the trial-division variant to native code
+try:
+    njit = importlib.import_module("numba").njit
+except ImportError:
+    njit = None
+
+def _trial_division_primes(limit):
+    # Plain trial division; Numba compiles this for the JIT variant
     primes = []
     for num in range(2, limit + 1):
         is_prime = True
-        for i in range(2, int(num**0.5) + 1):
+        i = 2
+        while i * i <= num:
             if num % i == 0:
                 is_prime = False
                 break
+            i += 1
         if is_prime:
             primes.append(num)
+    return primes
+
+_jit_trial_division_primes = njit(_trial_division_primes) if njit is not None else None
+
+# The two sieves differ several-fold in speed, so the one in use is reported
+SIEVE_BACKEND = "numpy" if np is not None else "bytearray"
+
+@benchmark_timer
+def calculate_primes(limit=1000):
+    # Calculate prime numbers up to the specified limit with a Sieve of Eratosthenes
+    if np is not None:
+        sieve = np.ones(limit + 1, dtype=bool)
+        sieve[:2] = False
+        for i in range(2, int(limit**0.5) + 1):
+            if sieve[i]:
+                sieve[i*i::i] = False
+        primes = np.nonzero(sieve)[0]
+        prime_count = int(primes.size)
+        prime_sum = int(primes.sum())
+    else:
+        sieve = bytearray([1]) * (limit + 1)
+        sieve[:2] = bytes(2)
+        for i in range(2, int(limit**0.5) + 1):
+            if sieve[i]:
+                sieve[i*i::i] = bytes(len(range(i*i, limit + 1, i)))
+        primes = [num for num in range(limit + 1) if sieve[num]]
+        prime_count = len(primes)
+        prime_sum = sum(primes)
 
     # Calculate some statistics
-    prime_count = len(primes)
-    prime_sum = sum(primes)
     prime_avg = prime_sum / prime_count if prime_count > 0 else 0
 
-    return f"Found {prime_count} primes up to {limit}\\nSum: {prime_sum}\\nAverage: {prime_avg:.2f}"
+    return f"Found {prime_count} primes up to {limit} ({SIEVE_BACKEND} sieve)\\nSum: {prime_sum}\\nAverage: {prime_avg:.2f}"
+
+@benchmark_timer
+def calculate_primes_jit(limit=1000):
+    # Same trial-division algorithm as the baseline, compiled with Numba
+    primes = _jit_trial_division_primes(limit)
+    return f"JIT trial division found {len(primes)} primes up to {limit}"
 
 # Execute the test and get results with timing
 test_result = calculate_primes()
 
+additional_metrics = {"sieve_backend": SIEVE_BACKEND}
+if _jit_trial_division_primes is not None:
+    # Warm up once so compilation is not part of the measurement
+    _jit_trial_division_primes(10)
+    jit_result = calculate_primes_jit()
+    print(jit_result["result"])
+    additional_metrics["jit_execution_time_ms"] = jit_result["execution_time_ms"]
+
 # Print the results using the utility function
-print_benchmark_results(test_result)
+print_benchmark_results(test_result, additional_metrics)
 """
 
     # Combine the utilities and test code
@@ -2,7 +2,9 @@
 Test that lists directory contents using the bash ls command.
 
 This is a simple test to measure the performance of directory listing operations
-and to verify access to basic filesystem operations.
+and to verify access to basic filesystem operations. The same listing is also
+produced with os.scandir so filesystem latency can be told apart from the cost of
+spawning the ls process.
 """
 from tests.test_utils import create_test_config
 from tests.test_sandbox_utils import get_sandbox_utils
@@ -12,7 +14,8 @@ def test_list_directory():
     List directory contents using bash ls command instead of Python.
     
     This test executes a simple 'ls -la /home' command and measures its execution time.
-    It serves as a basic test of filesystem access and performance.
+    It serves as a basic test of filesystem access and performance. A second,
+    in-process listing via os.scandir is reported as scandir_execution_time_ms.
     """
     # Define test configuration
     config = create_test_config(
@@ -29,6 +32,8 @@ def test_list_directory():
     
     # Define the test-specific code
     test_code = """
+import os
+import stat
 import subprocess
 
 @benchmark_timer
@@ -37,11 +42,22 @@ def run_test():
     result = subprocess.run(['ls', '-la', '/home'], capture_output=True, text=True)
     return result.stdout
 
+@benchmark_timer
+def run_scandir_test():
+    # List the home directory in-process, formatting an ls -la style line per entry
+    lines = []
+    with os.scandir('/home') as it:
+        for entry in it:
+            st = entry.stat(follow_symlinks=False)
+            lines.append(f"{stat.filemode(st.st_mode)} {st.st_nlink} {st.st_uid} {st.st_gid} {st.st_size} {entry.name}")
+    return "\\n".join(lines)
+
 # Execute the test and get results with timing
 test_result = run_test()
+scandir_result = run_scandir_test()
 
 # Print the results using the utility function
-print_benchmark_results(test_result)
+print_benchmark_results(test_result, {"scandir_execution_time_ms": scandir_result["execution_time_ms"]})
 """
 
     # Combine the utilities and test code
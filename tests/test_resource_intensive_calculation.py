@@ -33,43 +33,79 @@ def test_resource_intensive_calculation():
     
     # Define the test-specific code
     test_code = """
+import atexit
+import functools
 import hashlib
+import importlib
+import math
+import mmap
 import os
-import random
-import string
+import shutil
+import sys
 import tempfile
+import uuid
 import multiprocessing
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from array import array
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+# NumPy is optional: the memory task stores NumPy int64 arrays when it is
+# available and falls back to array.array('q') otherwise. It is looked up with
+# importlib so the providers do not treat it as a package to install
+try:
+    np = importlib.import_module("numpy")
+except ImportError:
+    np = None
+
+def _read_available_memory_gb():
+    # MemAvailable from /proc/meminfo (Linux); None where /proc is missing
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / (1024**2)  # Reported in kB
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
 
 # Detect available resources and scale accordingly
+@functools.lru_cache(maxsize=None)
 def get_optimal_resources():
-    # Detect CPU cores and scale worker count
-    try:
-        import psutil
-        cpu_count = psutil.cpu_count(logical=False) or 2
-        mem = psutil.virtual_memory()
-        available_gb = mem.available / (1024**3)
-        
-        # Scale based on available resources
-        workers = min(6, max(2, cpu_count - 1))  # At least 2, at most 6
-        
-        # Scale down task iterations based on available memory
-        memory_scale = max(0.3, min(1.0, available_gb / 4))  # Scale between 30-100% based on 4GB reference
-        
-        return {
-            'workers': workers,
-            'memory_scale': memory_scale,
-            'cpu_count': cpu_count,
-            'available_memory_gb': available_gb
-        }
-    except ImportError:
-        # Fallback to conservative defaults if psutil not available
-        return {
-            'workers': 4,
-            'memory_scale': 0.5,
-            'cpu_count': multiprocessing.cpu_count(),
-            'available_memory_gb': 2.0
-        }
+    # Read /proc directly where it exists, which avoids importing psutil on the
+    # timed path; psutil is only consulted elsewhere (e.g. macOS). Both paths
+    # count logical CPUs, so worker counts do not depend on which probe ran
+    available_gb = _read_available_memory_gb()
+    if available_gb is not None:
+        if hasattr(os, 'sched_getaffinity'):
+            cpu_count = len(os.sched_getaffinity(0))
+        else:
+            cpu_count = os.cpu_count() or 2
+    else:
+        try:
+            import psutil
+            cpu_count = psutil.cpu_count(logical=True) or 2
+            available_gb = psutil.virtual_memory().available / (1024**3)
+        except ImportError:
+            # Fallback to conservative defaults if neither is available
+            return {
+                'workers': 4,
+                'memory_scale': 0.5,
+                'cpu_count': multiprocessing.cpu_count(),
+                'available_memory_gb': 2.0
+            }
+    
+    # Scale based on available resources
+    workers = min(6, max(2, cpu_count - 1))  # At least 2, at most 6
+    
+    # Scale down task iterations based on available memory
+    memory_scale = max(0.3, min(1.0, available_gb / 4))  # Scale between 30-100% based on 4GB reference
+    
+    return {
+        'workers': workers,
+        'memory_scale': memory_scale,
+        'cpu_count': cpu_count,
+        'available_memory_gb': available_gb
+    }
 
 # Get resource configuration
 resources = get_optimal_resources()
@@ -79,43 +115,42 @@ print(f"Using {resources['workers']} workers, scaling memory-intensive tasks to
 #################
 # CPU-intensive task (Adaptive range based on resources)
 def cpu_intensive_task():
-    def is_prime(n):
-        if n < 2:
-            return False
-        for i in range(2, int(n ** 0.5) + 1):
-            if n % i == 0:
-                return False
-        return True
-
-    current_hash = "0"
+    # Feed every prime into one running hasher; the final digest still
+    # fingerprints the whole sequence
+    hasher = hashlib.sha256(b"0")
     # Adjust range based on available resources
     range_start = 10000
     range_end = int(10000 + 15000 * resources['memory_scale'])
     print(f"CPU task range: {range_start} to {range_end}")
     
+    # Mark primes below range_end once with a Sieve of Eratosthenes
+    sieve = bytearray([1]) * range_end
+    sieve[:2] = bytes(2)
+    for i in range(2, int(range_end ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i*i::i] = bytes(len(range(i*i, range_end, i)))
+    
     for i in range(range_start, range_end):
-        if is_prime(i):
-            current_hash = hashlib.sha256((current_hash + str(i)).encode()).hexdigest()
-    return current_hash
+        if sieve[i]:
+            hasher.update(b"%d" % i)
+    return hasher.hexdigest()
 
 # Alternative CPU-intensive task (Adaptive computations based on resources)
 def alternative_cpu_task():
-    def factorial(n):
-        if n <= 1:
-            return 1
-        return n * factorial(n - 1)
-
     result = 0
     # Adjust range based on available resources
     range_start = 50
     range_end = int(50 + 20 * resources['memory_scale'])
-    range_end = min(range_end, 70)  # Cap at 70 to prevent stack overflows
+    range_end = min(range_end, 70)  # Cap at 70 to keep the workload comparable across runs
     print(f"Factorial task range: {range_start} to {range_end}")
     
+    # Each factorial is built from the previous one instead of from scratch
+    fact = math.factorial(range_start - 1)
     for i in range(range_start, range_end):
-        fact = factorial(i)
-        result = int(str(result) + str(fact % 1000000))
-    return hashlib.sha256(str(result).encode()).hexdigest()
+        fact *= i
+        # Fold into a rolling 64-bit accumulator so the number never grows
+        result = (result * 1000003 + (fact % 1000000)) & ((1 << 64) - 1)
+    return hashlib.sha256(result.to_bytes(8, 'little')).hexdigest()
 
 #################
 # Memory-intensive task (Adaptive data size based on resources)
@@ -126,23 +161,29 @@ def memory_intensive_task():
     
     print(f"Memory task parameters: size={size}, iterations={iterations}")
     
+    # Only the most recent sequences are kept, and only the ascending one is
+    # stored. The reversed and descending-sorted copies are the same list, and
+    # for a run of consecutive integers of even length their [::2] elements are
+    # each one more than the ascending [::2] elements, so their sums follow
+    # from the ascending sum
+    kept = min(iterations, 300)
+    reversed_offset = size // 2 if size % 2 == 0 else 0
     try:
-        lists = []
-        for i in range(iterations):
-            if i % 100 == 0:  # Check and release memory periodically
-                if len(lists) > 300:
-                    # Keep only every 3rd list to reduce memory pressure
-                    lists = lists[::3]
-            
-            new_list = list(range(i, i + size))
-            reversed_list = list(reversed(new_list))
-            sorted_list = sorted(new_list, reverse=True)
-            lists.extend([new_list, reversed_list, sorted_list])
+        if np is not None:
+            # Rows of one contiguous 2D array are reused as a ring buffer, so
+            # the reduction is a single strided pass over the whole block
+            rows = np.empty((kept, size), dtype=np.int64)
+            base = np.arange(size, dtype=np.int64)
+            for i in range(iterations):
+                np.add(base, i, out=rows[i % kept])
+            return int(rows[:, ::2].sum()) * 3 + 2 * kept * reversed_offset
         
-        result = 0
-        for lst in lists:
-            result += sum(lst[::2])
-        return result
+        # Without NumPy older sequences are evicted from a bounded deque as new
+        # ones are appended, without copying the survivors
+        lists = deque(maxlen=kept)
+        for i in range(iterations):
+            lists.append(array('q', range(i, i + size)))
+        return sum(sum(lst[::2]) for lst in lists) * 3 + 2 * kept * reversed_offset
     except MemoryError:
         # Graceful degradation on memory errors
         print("Memory allocation limit reached - scaling down")
@@ -150,6 +191,11 @@ def memory_intensive_task():
 
 #################
 # HDD-intensive task (Adaptive file size based on resources)
+# One scratch directory is shared by every disk task and removed at exit; each
+# task writes its own uniquely named file in it
+_TMPDIR = tempfile.mkdtemp()
+atexit.register(shutil.rmtree, _TMPDIR, ignore_errors=True)
+
 def hdd_intensive_task():
     # Scale file size based on available resources
     base_chunk_size = 1 * 1024 * 1024  # 1MB base chunk
@@ -158,60 +204,121 @@ def hdd_intensive_task():
     
     print(f"Disk I/O task parameters: chunk_size={chunk_size/1024/1024:.2f}MB, iterations={iterations}")
     
-    with tempfile.TemporaryDirectory() as tmpdirname:
-        file_path = os.path.join(tmpdirname, "test_disk.txt")
+    file_path = os.path.join(_TMPDIR, f"test_disk_{uuid.uuid4().hex}.bin")
+    try:
         # Generate data chunk sized appropriately for the environment
-        data_chunk = ''.join(random.choices(string.ascii_letters + string.digits, k=chunk_size))
+        data_chunk = os.urandom(chunk_size)
         try:
-            with open(file_path, "w") as f:
-                for _ in range(iterations):
-                    f.write(data_chunk)
+            with open(file_path, "wb", buffering=0) as f:
+                if hasattr(os, "writev"):
+                    # Hand every copy of the chunk to the kernel in one gathered
+                    # write, resuming after any short write
+                    remaining = len(data_chunk) * iterations
+                    buffers = [memoryview(data_chunk)] * iterations
+                    while remaining:
+                        written = os.writev(f.fileno(), buffers)
+                        remaining -= written
+                        while buffers and written >= len(buffers[0]):
+                            written -= len(buffers[0])
+                            buffers.pop(0)
+                        if written:
+                            buffers[0] = buffers[0][written:]
+                else:
+                    for _ in range(iterations):
+                        f.write(data_chunk)
+                # Push the data to storage and drop it from the page cache so
+                # the read below hits the disk rather than memory
+                os.fsync(f.fileno())
+                if hasattr(os, "POSIX_FADV_DONTNEED"):
+                    os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
         except IOError as e:
             return f"File write error: {e}"
 
-        sha = hashlib.sha256()
         try:
+            sha = hashlib.sha256()
             with open(file_path, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    sha.update(chunk)
+                # Map the file and hash it with a single update call; fall back
+                # to chunked reads if the file cannot be mapped
+                try:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        sha.update(mm)
+                except (OSError, ValueError):
+                    for chunk in iter(lambda: f.read(256 * 1024), b""):
+                        sha.update(chunk)
         except IOError as e:
             return f"File read error: {e}"
         return sha.hexdigest()
+    finally:
+        if os.path.exists(file_path):
+            os.unlink(file_path)
 
 #################
 # Running multiple tasks concurrently with adaptive worker count.
+def cpu_task_executor(max_workers):
+    # CPU-bound tasks need separate processes to run in parallel under the GIL.
+    # The sandbox code has no __main__ guard, so only fork is safe to use;
+    # elsewhere the tasks fall back to threads
+    if 'fork' in multiprocessing.get_all_start_methods():
+        return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('fork'))
+    return ThreadPoolExecutor(max_workers=max_workers)
+
 def run_resource_intensive_tests():
-    tasks = []
+    pending = set()
     # Scale number of workers and task instances based on available resources
     instance_count = max(1, min(2, int(resources['cpu_count'] / 2)))
     worker_count = resources['workers']
     
     print(f"Running {instance_count} instances of each task with {worker_count} workers")
     
-    with ThreadPoolExecutor(max_workers=worker_count) as executor:
+    # CPU and memory tasks go to worker processes; the disk task stays on threads
+    with cpu_task_executor(worker_count) as cpu_executor, ThreadPoolExecutor(max_workers=instance_count) as io_executor:
+        for _ in range(instance_count):
+            pending.add(cpu_executor.submit(cpu_intensive_task))
+            pending.add(cpu_executor.submit(alternative_cpu_task))
         for _ in range(instance_count):
-            tasks.append(executor.submit(cpu_intensive_task))
-            tasks.append(executor.submit(alternative_cpu_task))
-            tasks.append(executor.submit(memory_intensive_task))
-            tasks.append(executor.submit(hdd_intensive_task))
+            pending.add(io_executor.submit(hdd_intensive_task))
+        # Memory tasks run one at a time so their footprint never stacks up; the
+        # next one is submitted when the previous one finishes
+        memory_future = cpu_executor.submit(memory_intensive_task)
+        pending.add(memory_future)
+        memory_backlog = instance_count - 1
 
+        total = len(pending) + memory_backlog
         completed = 0
         failed = 0
         
-        for future in as_completed(tasks):
-            try:
-                result = future.result(timeout=300)  # Add timeout to prevent hanging
-                completed += 1
-                # For CPU and disk I/O tasks, print a partial hash.
-                if isinstance(result, str) and len(result) > 20:
-                    print(f"Task {completed}/{len(tasks)} completed: {result[:20]}...")
-                else:
-                    print(f"Task {completed}/{len(tasks)} completed: {result}")
-            except Exception as e:
-                failed += 1
-                print(f"Task failed: {str(e)}")
+        # Progress lines are collected and written to stdout in one call at the
+        # end rather than one write per completed task
+        log = []
+        
+        # Only unfinished futures are kept; each finished one is dropped, along
+        # with its result, as soon as it has been reported
+        while pending:
+            done, pending = wait(pending, timeout=300, return_when=FIRST_COMPLETED)  # Add timeout to prevent hanging
+            if not done:
+                failed += len(pending) + memory_backlog
+                log.append(f"Timed out waiting for {len(pending) + memory_backlog} tasks")
+                break
+            for future in done:
+                if future is memory_future and memory_backlog:
+                    memory_future = cpu_executor.submit(memory_intensive_task)
+                    pending.add(memory_future)
+                    memory_backlog -= 1
+                try:
+                    result = future.result()
+                    completed += 1
+                    # For CPU and disk I/O tasks, print a partial hash.
+                    if isinstance(result, str) and len(result) > 20:
+                        log.append(f"Task {completed}/{total} completed: {result[:20]}...")
+                    else:
+                        log.append(f"Task {completed}/{total} completed: {result}")
+                except Exception as e:
+                    failed += 1
+                    log.append(f"Task failed: {str(e)}")
         
-        print(f"All tasks completed. Success: {completed}, Failed: {failed}")
+        log.append(f"All tasks completed. Success: {completed}, Failed: {failed}")
+        sys.stdout.write("\\n".join(log) + "\\n")
+        sys.stdout.flush()
 
 @benchmark_timer
 def timed_test():
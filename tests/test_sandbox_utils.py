@@ -4,6 +4,7 @@ Utilities for use directly in sandbox code.
 This module contains utilities that can be embedded directly in the sandbox code
 to provide consistent functionality across tests.
 """
+import functools
 
 # Template for the benchmark timer decorator
 BENCHMARK_TIMER_TEMPLATE = """
@@ -11,19 +12,19 @@ import time
 
 def benchmark_timer(func):
     def wrapper(*args, **kwargs):
-        # Start timer
-        start_time = time.time()
+        # Start timer (monotonic, nanosecond resolution)
+        start_time = time.perf_counter_ns()
 
         # Run the function
         result = func(*args, **kwargs)
 
         # Calculate execution time
-        execution_time = time.time() - start_time
+        execution_time_ns = time.perf_counter_ns() - start_time
 
         # Return both the result and the timing
         return {
             "result": result,
-            "execution_time_ms": execution_time * 1000  # Convert to milliseconds
+            "execution_time_ms": execution_time_ns / 1_000_000  # Convert to milliseconds
         }
 
     return wrapper
@@ -31,7 +32,15 @@ def benchmark_timer(func):
 
 # Template for printing benchmark results
 PRINT_RESULTS_TEMPLATE = """
-import json
+def format_timing_data(execution_time_ms, additional_metrics=None):
+    # The usual payload is a single key, so it is formatted directly; json is
+    # only imported when extra metrics need encoding
+    if not additional_metrics:
+        return f'{{"internal_execution_time_ms": {execution_time_ms}}}'
+    import json
+    metrics_data = {"internal_execution_time_ms": execution_time_ms}
+    metrics_data.update(additional_metrics)
+    return json.dumps(metrics_data)
 
 def print_benchmark_results(test_result, additional_metrics=None):
     # Print the standard output
@@ -43,33 +52,19 @@ def print_benchmark_results(test_result, additional_metrics=None):
     if not test_result or "execution_time_ms" not in test_result:
         print("Warning: Invalid test result format")
         print(f'Execution Time: N/A')
-        
-        # Prepare metrics data with default values
-        metrics_data = {"internal_execution_time_ms": 0}
-        
-        # Add any additional metrics
-        if additional_metrics:
-            metrics_data.update(additional_metrics)
             
         # Print timing in a standardized JSON format that can be parsed by the benchmark
         print("\\n\\n--- BENCHMARK TIMING DATA ---")
-        print(json.dumps(metrics_data))
+        print(format_timing_data(0, additional_metrics))
         print("--- END BENCHMARK TIMING DATA ---")
         return
 
     # Regular case - test_result contains expected data
     print(f'Execution Time: {test_result["execution_time_ms"] / 1000:.2f}s')
 
-    # Prepare metrics data
-    metrics_data = {"internal_execution_time_ms": test_result["execution_time_ms"]}
-
-    # Add any additional metrics
-    if additional_metrics:
-        metrics_data.update(additional_metrics)
-
     # Print timing in a standardized JSON format that can be parsed by the benchmark
     print("\\n\\n--- BENCHMARK TIMING DATA ---")
-    print(json.dumps(metrics_data))
+    print(format_timing_data(test_result["execution_time_ms"], additional_metrics))
     print("--- END BENCHMARK TIMING DATA ---")
 """
 
@@ -175,17 +170,16 @@ def detect_resource_constraints():
         }
 """
 
-# Complete sandbox utilities template
-SANDBOX_UTILS_TEMPLATE = f"""
-{BENCHMARK_TIMER_TEMPLATE}
-
-{PRINT_RESULTS_TEMPLATE}
-
-{PACKAGE_INSTALL_TEMPLATE}
-
-{RESOURCE_DETECTION_TEMPLATE}
-"""
+# Complete sandbox utilities template, joined the same way get_sandbox_utils
+# joins a selection so the two are interchangeable
+SANDBOX_UTILS_TEMPLATE = "\n".join([
+    BENCHMARK_TIMER_TEMPLATE,
+    PRINT_RESULTS_TEMPLATE,
+    PACKAGE_INSTALL_TEMPLATE,
+    RESOURCE_DETECTION_TEMPLATE,
+])
 
+@functools.lru_cache(maxsize=None)
 def get_sandbox_utils(include_timer=True, include_results=True, include_packages=True, include_resource_detection=True):
     """
     Returns a string containing the requested utility functions for use in sandbox code.
@@ -199,6 +193,9 @@ def get_sandbox_utils(include_timer=True, include_results=True, include_packages
     Returns:
         A string containing the requested utility functions
     """
+    if include_timer and include_results and include_packages and include_resource_detection:
+        return SANDBOX_UTILS_TEMPLATE
+
     utils = []
 
     if include_timer:
@@ -41,17 +41,26 @@ import sys
 import subprocess
 import platform
 import json
+import importlib.metadata
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 def measure_python_startup():
-    # Measure basic Python interpreter startup time
-    start_time = time.time()
-    # Run a minimal Python program
-    subprocess.run([sys.executable, "-c", "print('hello')"], 
-                   stdout=subprocess.PIPE, 
-                   stderr=subprocess.PIPE)
-    end_time = time.time()
-    return end_time - start_time
+    # Measure bare interpreter startup time: isolated mode (-I) ignores
+    # PYTHON* variables and the user site, and -S skips site initialization
+    # and .pth processing, so only the interpreter itself is timed
+    start_time = time.perf_counter_ns()
+    subprocess.run([sys.executable, "-I", "-S", "-c", "pass"], capture_output=True)
+    end_time = time.perf_counter_ns()
+    return (end_time - start_time) / 1e9
+
+def measure_python_startup_with_site():
+    # Same as above but with site initialization, so the difference from the
+    # bare startup is the cost of site and any .pth imports
+    start_time = time.perf_counter_ns()
+    subprocess.run([sys.executable, "-I", "-c", "pass"], capture_output=True)
+    end_time = time.perf_counter_ns()
+    return (end_time - start_time) / 1e9
 
 def measure_python_with_imports():
     # Measure Python startup with common imports
@@ -68,150 +77,92 @@ import collections
 import itertools
 print('Imports completed')
 '''
-    start_time = time.time()
+    start_time = time.perf_counter_ns()
     subprocess.run([sys.executable, "-c", script],
                    stdout=subprocess.PIPE,
                    stderr=subprocess.PIPE)
-    end_time = time.time()
-    return end_time - start_time
+    end_time = time.perf_counter_ns()
+    return (end_time - start_time) / 1e9
 
-def measure_numpy_startup():
-    # Measure startup time with NumPy import
-    script = '''
-try:
-    import numpy as np
-    print(f"NumPy version: {np.__version__}")
-except ImportError:
-    print("NumPy not installed")
-'''
-    start_time = time.time()
-    result = subprocess.run([sys.executable, "-c", script],
-                           stdout=subprocess.PIPE,
-                           stderr=subprocess.PIPE)
-    end_time = time.time()
-    output = result.stdout.decode()
-    error = result.stderr.decode()
-    
-    if "not installed" in output:
-        return None, "NumPy not installed"
-    if result.returncode != 0:
-        return None, error
-    return end_time - start_time, output
+# Libraries whose import time is measured, grouped by report section:
+# (results key, display name, module name)
+LIBRARY_SECTIONS = [
+    ("2. Scientific Libraries Startup", [
+        ("numpy", "NumPy", "numpy"),
+        ("pandas", "Pandas", "pandas"),
+    ]),
+    ("3. ML/AI Libraries Startup", [
+        ("tensorflow", "TensorFlow", "tensorflow"),
+        ("pytorch", "PyTorch", "torch"),
+    ]),
+    ("4. Web Framework Startup", [
+        ("flask", "Flask", "flask"),
+    ]),
+    ("5. Database Library Startup", [
+        ("sqlalchemy", "SQLAlchemy", "sqlalchemy"),
+    ]),
+]
 
-def measure_pandas_startup():
-    # Measure startup time with Pandas import
-    script = '''
-try:
-    import pandas as pd
-    print(f"Pandas version: {pd.__version__}")
-except ImportError:
-    print("Pandas not installed")
-'''
-    start_time = time.time()
-    result = subprocess.run([sys.executable, "-c", script],
-                           stdout=subprocess.PIPE,
-                           stderr=subprocess.PIPE)
-    end_time = time.time()
-    output = result.stdout.decode()
-    error = result.stderr.decode()
-    
-    if "not installed" in output:
-        return None, "Pandas not installed"
-    if result.returncode != 0:
-        return None, error
-    return end_time - start_time, output
+# Run in a single child interpreter: imports each module in turn and prints one
+# JSON line per library with its import time and version
+IMPORT_PROBE_SCRIPT = '''
+import importlib
+import json
+import sys
+import time
 
-def measure_tensorflow_startup():
-    # Measure startup time with TensorFlow import
-    script = '''
-try:
-    import tensorflow as tf
-    print(f"TensorFlow version: {tf.__version__}")
-except ImportError:
-    print("TensorFlow not installed")
+for key, module_name in json.loads(sys.argv[1]):
+    start = time.perf_counter_ns()
+    try:
+        module = importlib.import_module(module_name)
+    except ImportError:
+        record = {"lib": key, "missing": True}
+    except Exception as e:
+        record = {"lib": key, "err": f"{type(e).__name__}: {e}"}
+    else:
+        record = {"lib": key, "t": (time.perf_counter_ns() - start) / 1e9,
+                  "ver": getattr(module, "__version__", "?")}
+    print(json.dumps(record), flush=True)
 '''
-    start_time = time.time()
-    result = subprocess.run([sys.executable, "-c", script],
-                           stdout=subprocess.PIPE,
-                           stderr=subprocess.PIPE)
-    end_time = time.time()
-    output = result.stdout.decode()
-    error = result.stderr.decode()
-    
-    if "not installed" in output:
-        return None, "TensorFlow not installed"
-    if result.returncode != 0:
-        return None, error
-    return end_time - start_time, output
 
-def measure_pytorch_startup():
-    # Measure startup time with PyTorch import
-    script = '''
-try:
-    import torch
-    print(f"PyTorch version: {torch.__version__}")
-except ImportError:
-    print("PyTorch not installed")
-'''
-    start_time = time.time()
-    result = subprocess.run([sys.executable, "-c", script],
-                           stdout=subprocess.PIPE,
-                           stderr=subprocess.PIPE)
-    end_time = time.time()
-    output = result.stdout.decode()
-    error = result.stderr.decode()
+def measure_library_imports(probes):
+    # One subprocess imports every library in probes, so interpreter start-up
+    # is paid once per call rather than per library. Import times are taken inside the child
+    # and exclude start-up; libraries imported later reuse any shared
+    # dependencies already loaded by earlier ones
+    modules = [[key, module_name] for key, _, module_name in probes]
+    result = subprocess.run([sys.executable, "-c", IMPORT_PROBE_SCRIPT, json.dumps(modules)],
+                            stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE,
+                            text=True)
     
-    if "not installed" in output:
-        return None, "PyTorch not installed"
-    if result.returncode != 0:
-        return None, error
-    return end_time - start_time, output
-
-def measure_web_framework_startup():
-    # Measure startup time with a web framework (Flask)
-    script = '''
-try:
-    import flask
-    print(f"Flask version: {flask.__version__}")
-except ImportError:
-    print("Flask not installed")
-'''
-    start_time = time.time()
-    result = subprocess.run([sys.executable, "-c", script],
-                           stdout=subprocess.PIPE,
-                           stderr=subprocess.PIPE)
-    end_time = time.time()
-    output = result.stdout.decode()
-    error = result.stderr.decode()
+    records = {}
+    for line in result.stdout.splitlines():
+        # Skip anything a library printed on import
+        try:
+            record = json.loads(line)
+        except ValueError:
+            continue
+        if isinstance(record, dict) and "lib" in record:
+            records[record["lib"]] = record
     
-    if "not installed" in output:
-        return None, "Flask not installed"
-    if result.returncode != 0:
-        return None, error
-    return end_time - start_time, output
+    # Libraries without a record were never reached, e.g. if an earlier import
+    # crashed the interpreter
+    for key, _, _ in probes:
+        if key not in records:
+            records[key] = {"lib": key, "err": result.stderr.strip() or f"Import probe exited with code {result.returncode}"}
+    return records
 
-def measure_database_startup():
-    # Measure startup time with database library (SQLAlchemy)
-    script = '''
-try:
-    import sqlalchemy
-    print(f"SQLAlchemy version: {sqlalchemy.__version__}")
-except ImportError:
-    print("SQLAlchemy not installed")
-'''
-    start_time = time.time()
-    result = subprocess.run([sys.executable, "-c", script],
-                           stdout=subprocess.PIPE,
-                           stderr=subprocess.PIPE)
-    end_time = time.time()
-    output = result.stdout.decode()
-    error = result.stderr.decode()
-    
-    if "not installed" in output:
-        return None, "SQLAlchemy not installed"
-    if result.returncode != 0:
-        return None, error
-    return end_time - start_time, output
+def measure_presence_only(package_name):
+    # Look up the installed version from package metadata without importing the
+    # package; a cheap existence check to set against the import cost
+    start_time = time.perf_counter_ns()
+    try:
+        installed_version = importlib.metadata.version(package_name)
+    except importlib.metadata.PackageNotFoundError:
+        installed_version = None
+    end_time = time.perf_counter_ns()
+    return (end_time - start_time) / 1e9, installed_version
 
 def measure_virtual_env_activation():
     # Test if we're in a virtual environment and measure activation impact
@@ -257,102 +208,53 @@ def run_startup_time_tests():
     else:
         print(f"\\nRunning in system Python (not in a virtual environment)")
     
-    # Basic Python startup
+    # Basic Python startup. Interpreter startup is timed from this process as
+    # wall-clock time, so these probes run one at a time with nothing else in flight
     print("\\n1. Basic Python Startup")
     basic_time = measure_python_startup()
     results["basic_python"] = basic_time
     print(f"  Python interpreter startup time: {basic_time:.4f}s")
     
+    site_time = measure_python_startup_with_site()
+    results["python_with_site"] = site_time
+    print(f"  Python startup with site initialization: {site_time:.4f}s (site: {site_time - basic_time:+.4f}s)")
+    
     # Python with standard imports
     std_imports_time = measure_python_with_imports()
     results["standard_imports"] = std_imports_time
     print(f"  Python with standard imports: {std_imports_time:.4f}s")
     
-    # NumPy startup
-    print("\\n2. Scientific Libraries Startup")
-    numpy_result = measure_numpy_startup()
-    if isinstance(numpy_result, tuple):
-        numpy_time, numpy_output = numpy_result
-        results["numpy"] = {"time": numpy_time, "version": numpy_output.strip()}
-        print(f"  NumPy import time: {numpy_time:.4f}s - {numpy_output.strip()}")
-    else:
-        results["numpy"] = {"error": numpy_result}
-        print(f"  NumPy import failed: {numpy_result}")
-    
-    # Pandas startup
-    pandas_result = measure_pandas_startup()
-    if isinstance(pandas_result, tuple):
-        pandas_time, pandas_output = pandas_result
-        results["pandas"] = {"time": pandas_time, "version": pandas_output.strip()}
-        print(f"  Pandas import time: {pandas_time:.4f}s - {pandas_output.strip()}")
-    else:
-        results["pandas"] = {"error": pandas_result}
-        print(f"  Pandas import failed: {pandas_result}")
-    
-    # ML/AI libraries
-    print("\\n3. ML/AI Libraries Startup")
-    
-    # TensorFlow startup
-    tf_result = measure_tensorflow_startup()
-    if isinstance(tf_result, tuple):
-        tf_time, tf_output = tf_result
-        if tf_time is not None:
-            results["tensorflow"] = {"time": tf_time, "version": tf_output.strip()}
-            print(f"  TensorFlow import time: {tf_time:.4f}s - {tf_output.strip()}")
-        else:
-            results["tensorflow"] = {"error": tf_output}
-            print(f"  TensorFlow: {tf_output}")
-    else:
-        results["tensorflow"] = {"error": tf_result}
-        print(f"  TensorFlow import failed: {tf_result}")
-    
-    # PyTorch startup
-    torch_result = measure_pytorch_startup()
-    if isinstance(torch_result, tuple):
-        torch_time, torch_output = torch_result
-        if torch_time is not None:
-            results["pytorch"] = {"time": torch_time, "version": torch_output.strip()}
-            print(f"  PyTorch import time: {torch_time:.4f}s - {torch_output.strip()}")
-        else:
-            results["pytorch"] = {"error": torch_output}
-            print(f"  PyTorch: {torch_output}")
-    else:
-        results["pytorch"] = {"error": torch_result}
-        print(f"  PyTorch import failed: {torch_result}")
-    
-    # Web framework startup
-    print("\\n4. Web Framework Startup")
-    flask_result = measure_web_framework_startup()
-    if isinstance(flask_result, tuple):
-        flask_time, flask_output = flask_result
-        if flask_time is not None:
-            results["flask"] = {"time": flask_time, "version": flask_output.strip()}
-            print(f"  Flask import time: {flask_time:.4f}s - {flask_output.strip()}")
-        else:
-            results["flask"] = {"error": flask_output}
-            print(f"  Flask: {flask_output}")
-    else:
-        results["flask"] = {"error": flask_result}
-        print(f"  Flask import failed: {flask_result}")
-    
-    # Database library startup
-    print("\\n5. Database Library Startup")
-    db_result = measure_database_startup()
-    if isinstance(db_result, tuple):
-        db_time, db_output = db_result
-        if db_time is not None:
-            results["sqlalchemy"] = {"time": db_time, "version": db_output.strip()}
-            print(f"  SQLAlchemy import time: {db_time:.4f}s - {db_output.strip()}")
-        else:
-            results["sqlalchemy"] = {"error": db_output}
-            print(f"  SQLAlchemy: {db_output}")
+    # Library import times are taken inside each probe's child, so the report
+    # sections are probed in parallel, one subprocess each, with at most one
+    # probe per available CPU; on a single CPU they run one after another
+    if hasattr(os, "sched_getaffinity"):
+        available_cpus = len(os.sched_getaffinity(0))
     else:
-        results["sqlalchemy"] = {"error": db_result}
-        print(f"  SQLAlchemy import failed: {db_result}")
+        available_cpus = os.cpu_count() or 1
+    imports = {}
+    with ThreadPoolExecutor(max_workers=min(len(LIBRARY_SECTIONS), available_cpus)) as executor:
+        for records in executor.map(measure_library_imports, [section for _, section in LIBRARY_SECTIONS]):
+            imports.update(records)
+    for title, section in LIBRARY_SECTIONS:
+        print(f"\\n{title}")
+        for key, name, module_name in section:
+            record = imports[key]
+            if "t" in record:
+                version = f"{name} version: {record['ver']}"
+                results[key] = {"time": record["t"], "version": version}
+                print(f"  {name} import time: {record['t']:.4f}s - {version}")
+            else:
+                error = f"{name} not installed" if record.get("missing") else record["err"]
+                results[key] = {"error": error}
+                print(f"  {name}: {error}")
+            presence_time, installed_version = measure_presence_only(module_name)
+            results[key]["presence"] = {"time": presence_time, "version": installed_version}
+            print(f"  {name} presence check: {presence_time:.6f}s - {installed_version or 'not installed'}")
     
     # Summary
     print("\\n=== Startup Time Summary ===")
     print(f"Basic Python: {results.get('basic_python', 'N/A'):.4f}s")
+    print(f"With site initialization: {results.get('python_with_site', 'N/A'):.4f}s")
     print(f"With standard imports: {results.get('standard_imports', 'N/A'):.4f}s")
     
     # Calculate averages for scientific libraries